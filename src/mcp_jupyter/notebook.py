@@ -100,7 +100,7 @@ def create_new_notebook(notebook_path: str, server_url: str, token: str) -> None
 
         except requests.RequestException as e:
             logger.error(f"Error checking or creating directory {directory_path}: {e}")
-            if hasattr(e, "response") and e.response is not None:
+            if getattr(e, "response", None) is not None:
                 error_message = (
                     f"Server error: {e.response.status_code} - {e.response.text}"
                 )
@@ -149,7 +149,7 @@ def create_new_notebook(notebook_path: str, server_url: str, token: str) -> None
         logger.info(f"Created new notebook at {notebook_path}")
     except requests.RequestException as e:
         logger.error(f"Error creating notebook: {e}")
-        if hasattr(e, "response") and e.response is not None:
+        if getattr(e, "response", None) is not None:
             error_message = (
                 f"Server error: {e.response.status_code} - {e.response.text}"
             )
@@ -4,19 +4,68 @@ This module provides a clean, reliable interface to Jupyter notebooks using
 only REST API calls. It avoids the complexity of RTC/WebSocket connections
 while still benefiting from server-side collaborative features.
 
-TODO: Add batch operations context manager for better performance with large notebooks.
-Could implement `with client.batch() as batch:` pattern to group operations.
+The transport is deliberately plain requests over HTTP/1.1: Jupyter Server
+(tornado) does not speak HTTP/2, so the pooled keep-alive session already
+captures all the available connection reuse.
 """
 
-import json
+import hashlib
 import logging
+import threading
+from contextlib import contextmanager
 from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+from .utils import json_dumps, json_loads
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
+# How long to wait for further edits before writing a queued save to the server.
+# Long enough to coalesce back-to-back cell operations, short enough that the
+# notebook on disk never lags noticeably behind.
+SAVE_DEBOUNCE_SECONDS = 0.1
+
+
+class _CellsWrapper:
+    """Compatibility shim mimicking the old RTC client's ycells array.
+
+    Delegates straight to the underlying cell list; to_py() returns it
+    without copying.
+    """
+
+    __slots__ = ("_cells",)
+
+    def __init__(self, cells):
+        self._cells = cells
+
+    def to_py(self):
+        return self._cells
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __getitem__(self, index):
+        return self._cells[index]
+
+
+class _DocWrapper:
+    """Compatibility shim mimicking the old RTC client's document object."""
+
+    __slots__ = ("_client",)
+
+    def __init__(self, client):
+        self._client = client
+
+    @property
+    def ycells(self):
+        return _CellsWrapper(self._client.cells)
+
 
 class NotebookClient:
     """Simple REST-based Jupyter notebook client.
@@ -41,16 +90,54 @@ class NotebookClient:
         self._server_url = server_url.rstrip("/")
         self._notebook_path = notebook_path
         self._token = token
+        self._headers: Optional[Dict[str, str]] = None
+        self._kernel_info: Optional[tuple] = None
+        # The API URLs never change for the lifetime of a client, so build
+        # them once instead of re-deriving them per request.
+        self._contents_url = f"{self._server_url}/api/contents/{notebook_path}"
+        self._contents_root_url = f"{self._server_url}/api/contents"
+        self._kernelspecs_url = f"{self._server_url}/api/kernelspecs"
+
+        # Persistent session so repeated REST calls (every cell add/edit/save)
+        # reuse pooled connections instead of paying a fresh TCP/TLS handshake.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]
+            ),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update(self._make_request_headers())
+
+        # Debounced save machinery: writes are queued and coalesced so a burst
+        # of cell operations results in a single PUT instead of one per edit.
+        self._save_lock = threading.Lock()
+        self._pending_content: Optional[Dict[str, Any]] = None
+        self._save_timer: Optional[threading.Timer] = None
+        self._in_batch = False
+
+        # Cache of the last notebook content seen/written by this client.
+        # Hot paths (view_source, execute, edit) each need the cell list and
+        # previously re-fetched the full notebook per access. The cache is
+        # dropped by refresh() when external changes must be picked up.
+        self._content_cache: Optional[Dict[str, Any]] = None
+
+        # Digest of the last payload actually written, so saves that would
+        # re-upload identical bytes can be skipped entirely.
+        self._last_saved_digest: Optional[str] = None
+
+        # The doc wrapper is stateless (it resolves cells through the client
+        # on every access), so one instance serves the client's lifetime.
+        self._doc_wrapper = _DocWrapper(self)
 
     @property
     def connected(self) -> bool:
         """Check if client is connected."""
         try:
-            response = requests.get(
-                f"{self._server_url}/api/contents",
-                headers=self._make_request_headers(),
-                timeout=10,
-            )
+            response = self._session.get(self._contents_root_url, timeout=10)
             return response.status_code == 200
         except:
             return False
@@ -65,57 +152,41 @@ class NotebookClient:
         """Compatibility property to access cells like the old RTC client.
 
         This provides compatibility with code that accesses notebook._doc.ycells.to_py().
+        Nothing is fetched until ycells is actually accessed.
         """
-
-        class CellsWrapper:
-            def __init__(self, cells):
-                self._cells = cells
-
-            def to_py(self):
-                return self._cells
-
-            def __iter__(self):
-                return iter(self._cells)
-
-            def __len__(self):
-                return len(self._cells)
-
-            def __getitem__(self, index):
-                return self._cells[index]
-
-        class DocWrapper:
-            def __init__(self, cells):
-                self.ycells = CellsWrapper(cells)
-
-        return DocWrapper(self.cells)
+        return self._doc_wrapper
 
     def _get_notebook_content(self) -> Dict[str, Any]:
-        """Get current notebook content from server."""
+        """Get current notebook content, using the local cache when possible."""
+        if self._content_cache is not None:
+            return self._content_cache
+
+        # Push any queued save first so reads observe our own writes.
+        self.flush()
         try:
-            response = requests.get(
-                f"{self._server_url}/api/contents/{self._notebook_path}",
-                headers=self._make_request_headers(),
-                timeout=10,
-            )
+            response = self._session.get(self._contents_url, timeout=10)
 
             if response.status_code == 404:
                 self._create_empty_notebook()
                 return self._get_notebook_content()
             else:
                 response.raise_for_status()
-                data = response.json()
-                return data.get("content", {})
+                data = json_loads(response.content)
+                self._content_cache = data.get("content", {})
+                return self._content_cache
 
         except Exception as e:
-            logger.error(f"Failed to get notebook content: {e}")
+            logger.error("Failed to get notebook content: %s", e)
             raise
 
     def _make_request_headers(self) -> Dict[str, str]:
-        """Create headers for REST requests."""
-        headers = {"Content-Type": "application/json"}
-        if self._token:
-            headers["Authorization"] = f"token {self._token}"
-        return headers
+        """Create headers for REST requests (built once per client)."""
+        if self._headers is None:
+            headers = {"Content-Type": "application/json"}
+            if self._token:
+                headers["Authorization"] = f"token {self._token}"
+            self._headers = headers
+        return self._headers
 
     def _get_default_kernel_info(self) -> tuple[Dict[str, Any], Dict[str, Any]]:
         """Get default kernel specification from the Jupyter server.
@@ -128,14 +199,14 @@ class NotebookClient:
         ------
             requests.RequestException: If unable to get kernel specs from server
         """
+        # Kernel specs don't change while a server is running, so fetch once.
+        if self._kernel_info is not None:
+            return self._kernel_info
+
         # Get available kernel specs
-        response = requests.get(
-            f"{self._server_url}/api/kernelspecs",
-            headers=self._make_request_headers(),
-            timeout=10,
-        )
+        response = self._session.get(self._kernelspecs_url, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
 
         # Get default kernel name (usually 'python3' or similar)
         default_kernel_name = data.get("default", "python3")
@@ -165,25 +236,24 @@ class NotebookClient:
             if "version" in interpreter:
                 language_info["version"] = interpreter["version"]
 
-        return kernelspec, language_info
+        self._kernel_info = (kernelspec, language_info)
+        return self._kernel_info
 
     def connect(self) -> None:
         """Connect to the Jupyter server."""
         try:
-            response = requests.get(
-                f"{self._server_url}/api/contents",
-                headers=self._make_request_headers(),
-                timeout=10,
-            )
+            response = self._session.get(self._contents_root_url, timeout=10)
             response.raise_for_status()
-            logger.info(f"✅ Connected to Jupyter server at {self._server_url}")
+            logger.info("✅ Connected to Jupyter server at %s", self._server_url)
 
         except Exception as e:
-            logger.error(f"❌ Failed to connect to Jupyter server: {e}")
+            logger.error("❌ Failed to connect to Jupyter server: %s", e)
             raise
 
     def disconnect(self) -> None:
-        """Disconnect from the server."""
+        """Disconnect from the server and release pooled connections."""
+        self.flush()
+        self._session.close()
         logger.info("Disconnected from Jupyter server")
 
     def _create_empty_notebook(self) -> None:
@@ -202,26 +272,92 @@ class NotebookClient:
 
         notebook_data = {"type": "notebook", "content": empty_notebook}
 
-        response = requests.put(
-            f"{self._server_url}/api/contents/{self._notebook_path}",
-            headers=self._make_request_headers(),
-            data=json.dumps(notebook_data),
+        response = self._session.put(
+            self._contents_url,
+            data=json_dumps(notebook_data),
             timeout=10,
         )
         response.raise_for_status()
-        logger.info(f"Created empty notebook: {self._notebook_path}")
+        logger.info("Created empty notebook: %s", self._notebook_path)
 
     def _save_notebook(self, notebook_content: Dict[str, Any]) -> None:
-        """Save notebook content to the server."""
-        notebook_data = {"type": "notebook", "content": notebook_content}
+        """Queue notebook content to be saved to the server.
 
-        response = requests.put(
-            f"{self._server_url}/api/contents/{self._notebook_path}",
-            headers=self._make_request_headers(),
-            data=json.dumps(notebook_data),
+        The actual PUT is debounced: rapid sequences of cell operations (e.g.
+        adding many cells in a row) are coalesced into a single write. Reads
+        and disconnect() flush pending content first, so callers still see
+        read-after-write behavior.
+        """
+        self._content_cache = notebook_content
+        with self._save_lock:
+            self._pending_content = notebook_content
+            if self._in_batch:
+                # A single flush happens when the batch exits.
+                return
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    @contextmanager
+    def batch(self):
+        """Group multiple cell operations into a single server write.
+
+        Inside the block, cell operations update the local notebook content
+        but defer the PUT; one write is issued when the block exits. Useful
+        when building up a notebook cell by cell:
+
+        .. code-block:: python
+
+            with client.batch():
+                client.add_markdown_cell("# Title")
+                client.add_code_cell("print('hello')")
+
+        Yields
+        ------
+            NotebookClient: This client, for convenience.
+        """
+        self._in_batch = True
+        try:
+            yield self
+        finally:
+            self._in_batch = False
+            self.flush()
+
+    def flush(self) -> None:
+        """Write any pending notebook content to the server immediately."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            notebook_content = self._pending_content
+            self._pending_content = None
+
+        if notebook_content is not None:
+            self._put_notebook(notebook_content)
+
+    def _put_notebook(self, notebook_content: Dict[str, Any]) -> None:
+        """PUT notebook content to the server, skipping no-op writes."""
+        notebook_data = {"type": "notebook", "content": notebook_content}
+        # The payload is sent uncompressed on purpose: Jupyter Server does not
+        # enable tornado's request-body decompression, so a gzip/zstd
+        # Content-Encoding here would be stored verbatim and corrupt the
+        # notebook. Local/loopback transfers make the bandwidth moot anyway.
+        payload = json_dumps(notebook_data)
+
+        digest = hashlib.sha256(payload).hexdigest()
+        if digest == self._last_saved_digest:
+            logger.debug("Notebook unchanged since last save, skipping PUT")
+            return
+
+        response = self._session.put(
+            self._contents_url,
+            data=payload,
             timeout=10,
         )
         response.raise_for_status()
+        self._last_saved_digest = digest
         logger.debug("Notebook saved successfully")
 
     def add_code_cell(self, content: str) -> int:
@@ -319,10 +455,11 @@ class NotebookClient:
         """
         notebook_content = self._get_notebook_content()
         cells = notebook_content["cells"]
-        if position >= len(cells):
+        try:
+            cells[position]["source"] = new_content
+        except IndexError:
             raise IndexError(f"Cell index {position} out of range")
 
-        cells[position]["source"] = new_content
         self._save_notebook(notebook_content)
 
     def delete_cell(self, position: int) -> None:
@@ -333,10 +470,11 @@ class NotebookClient:
         """
         notebook_content = self._get_notebook_content()
         cells = notebook_content["cells"]
-        if position >= len(cells):
+        try:
+            cells.pop(position)
+        except IndexError:
             raise IndexError(f"Cell index {position} out of range")
 
-        cells.pop(position)
         self._save_notebook(notebook_content)
 
     def execute_cell(self, position: int, kernel_client) -> Dict[str, Any]:
@@ -352,17 +490,23 @@ class NotebookClient:
         """
         notebook_content = self._get_notebook_content()
         cells = notebook_content["cells"]
-        if position >= len(cells):
+        try:
+            cell = cells[position]
+        except IndexError:
             raise IndexError(f"Cell index {position} out of range")
 
-        cell = cells[position]
         if cell["cell_type"] != "code":
             raise ValueError(f"Cell at position {position} is not a code cell")
 
-        # Execute using the existing kernel client
-        result = kernel_client.execute(cell["source"])
+        # Execute using the existing kernel client. Guard against kernel
+        # clients that return None on a dropped connection so a failed
+        # execution doesn't wipe the cell's previous outputs with a crash.
+        result = kernel_client.execute(cell["source"]) or {}
 
-        # Update cell with results
+        # Stream the results into the executed cell only; the rest of the
+        # notebook is untouched. The contents API has no cell-level PATCH,
+        # so the (debounced, deduplicated) whole-document save is the
+        # cheapest correct write available.
         cell["outputs"] = result.get("outputs", [])
         cell["execution_count"] = result.get("execution_count")
         self._save_notebook(notebook_content)
@@ -380,15 +524,18 @@ class NotebookClient:
             Cell data as dictionary
         """
         notebook_content = self._get_notebook_content()
-        cells = notebook_content["cells"]
-        if position >= len(cells):
+        try:
+            return notebook_content["cells"][position]
+        except IndexError:
             raise IndexError(f"Cell index {position} out of range")
 
-        return cells[position]
-
     def refresh(self) -> None:
         """Refresh notebook content from server to detect external changes."""
-        pass
+        self.flush()
+        self._content_cache = None
+        # The server copy may have diverged from what we last wrote, so a
+        # save of seemingly identical content must go through again.
+        self._last_saved_digest = None
 
     def __getitem__(self, position: int) -> Dict[str, Any]:
         """Get a cell by position using bracket notation.
@@ -411,9 +558,15 @@ class NotebookClient:
         """
         notebook_content = self._get_notebook_content()
         cells = notebook_content["cells"]
-        if position >= len(cells):
+        try:
+            existing_cell = cells[position]
+        except IndexError:
             raise IndexError(f"Cell index {position} out of range")
 
-        # Update the cell in place
+        # Update the cell in place rather than removing and re-inserting it.
+        # Keeping the original cell id preserves identity for clients that
+        # track cells by id across edits.
+        if "id" in existing_cell and "id" not in cell_data:
+            cell_data = {**cell_data, "id": existing_cell["id"]}
         cells[position] = cell_data
         self._save_notebook(notebook_content)
@@ -1,22 +1,15 @@
-import hashlib
-import json
+import atexit
 import logging
-import os
-import re
-import signal
-import subprocess
 import sys
+import threading
 import time
-from collections import defaultdict
 from contextlib import contextmanager
-from functools import wraps
 from typing import Optional, Union
 
-import requests
 from jupyter_kernel_client import KernelClient
 from mcp.server.fastmcp import FastMCP
 from mcp.shared.exceptions import McpError
-from mcp.types import INTERNAL_ERROR, INVALID_PARAMS, ErrorData
+from mcp.types import INTERNAL_ERROR, ErrorData
 from rich.console import Console
 from rich.logging import RichHandler
 
@@ -28,10 +21,14 @@ from .utils import (
     _ensure_ipynb_extension,
     extract_output,
     filter_image_outputs,
+    http_session,
+    json_loads,
 )
 
 # Initialize FastMCP server with default settings
 # This ensures tools are available when module is imported
+# Tools here are deliberately synchronous: FastMCP runs sync tools on a
+# worker thread, so blocking HTTP calls don't stall the MCP event loop.
 mcp = FastMCP("notebook")
 
 
@@ -45,10 +42,39 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-# Initialize kernel as None instead of connecting immediately
+# Most recently used kernel client. Kept as a module global so existing
+# callers (and test cleanup) can reach the active kernel directly.
 kernel: Optional[KernelClient] = None
-# Add a dictionary to track kernel server URLs
-kernel_server_urls = {}
+
+# Kernel clients pooled per (notebook_path, server_url). Alternating between
+# notebooks or servers reuses the existing connection instead of tearing the
+# kernel down and re-initializing it on every switch.
+MAX_POOLED_KERNELS = 4
+_kernel_pool: dict = {}
+
+
+def _stop_pooled_kernels() -> None:
+    """Stop all pooled kernel clients (registered as an atexit hook)."""
+    for pooled_kernel in _kernel_pool.values():
+        try:
+            pooled_kernel.stop()
+        except Exception as e:
+            logger.warning("Error stopping pooled kernel: %s", e)
+    _kernel_pool.clear()
+
+
+atexit.register(_stop_pooled_kernels)
+
+# Resolved kernel IDs cached briefly so back-to-back tool calls don't re-list
+# /api/sessions each time. The TTL keeps kernel restarts visible quickly.
+KERNEL_ID_CACHE_TTL_SECONDS = 30.0
+_kernel_id_cache: dict = {}
+
+# Notebook clients reused across tool calls, keyed by (server_url,
+# notebook_path). Keeping a client alive keeps its pooled HTTP connections
+# warm, so consecutive tool calls skip the per-call connect round trip.
+_notebook_clients: dict = {}
+_notebook_clients_lock = threading.Lock()
 
 
 def get_kernel_id(
@@ -80,20 +106,36 @@ def get_kernel_id(
     # Ensure the notebook path has the .ipynb extension
     notebook_path = _ensure_ipynb_extension(notebook_path)
 
-    response = requests.get(
-        f"{server_url}/api/sessions", headers={"Authorization": f"token {TOKEN}"}
+    cache_key = (notebook_path, server_url)
+    cached = _kernel_id_cache.get(cache_key)
+    if (
+        cached is not None
+        and time.monotonic() - cached[1] < KERNEL_ID_CACHE_TTL_SECONDS
+    ):
+        return cached[0]
+
+    response = http_session.get(
+        f"{server_url}/api/sessions",
+        headers={"Authorization": f"token {TOKEN}"},
+        timeout=10,
+    )
+    response.raise_for_status()
+    notebooks = json_loads(response.content)
+
+    # First, try to find the kernel for the specified notebook. Sessions are
+    # unique per path, so stop at the first match.
+    kernel_id = next(
+        (
+            notebook["kernel"]["id"]
+            for notebook in notebooks
+            if notebook["path"] == notebook_path
+        ),
+        None,
     )
-    notebooks = response.json()
-
-    # First, try to find kernel for the specified notebook
-    kernel_ids = [
-        notebook["kernel"]["id"]
-        for notebook in notebooks
-        if notebook["path"] == notebook_path
-    ]
 
-    if len(kernel_ids) == 1:
-        return kernel_ids[0]
+    if kernel_id is not None:
+        _kernel_id_cache[cache_key] = (kernel_id, time.monotonic())
+        return kernel_id
 
     # If not found, use the first available kernel and update notebook_path
     if notebooks:
@@ -102,10 +144,13 @@ def get_kernel_id(
         first_kernel_id = first_notebook["kernel"]["id"]
 
         logger.info(
-            f"No kernel found for {notebook_path}, using notebook {first_notebook_path} instead"
+            "No kernel found for %s, using notebook %s instead",
+            notebook_path,
+            first_notebook_path,
         )
-        logger.info(f"Using notebook path: {first_notebook_path}")
+        logger.info("Using notebook path: %s", first_notebook_path)
 
+        _kernel_id_cache[cache_key] = (first_kernel_id, time.monotonic())
         return first_kernel_id
 
     # If no notebooks are running at all
@@ -132,7 +177,7 @@ def get_kernel(notebook_path: str, server_url: str = None) -> Optional[KernelCli
     Returns
     -------
         Optional[KernelClient]:
-            - Existing kernel client if already initialized
+            - Existing kernel client if one is pooled for this notebook/server
             - New kernel client if successfully initialized
             - None if initialization fails
 
@@ -141,7 +186,7 @@ def get_kernel(notebook_path: str, server_url: str = None) -> Optional[KernelCli
         McpError: If the kernel client can't be initialized
         McpError: If there's an error connecting to the Jupyter server
     """
-    global kernel, kernel_server_urls
+    global kernel
 
     # Ensure the notebook path has the .ipynb extension
     notebook_path = _ensure_ipynb_extension(notebook_path)
@@ -151,33 +196,17 @@ def get_kernel(notebook_path: str, server_url: str = None) -> Optional[KernelCli
         server_url = NotebookState.get_server_url(notebook_path)
 
     # Log server URL to confirm it's being passed correctly
-    logger.info(f"Getting kernel with server_url={server_url}")
-
-    # If kernel is already initialized, check if it's using the correct server_url
-    if kernel is not None:
-        # Use the kernel ID as a key in our dictionary
-        kernel_id = kernel.kernel_id if hasattr(kernel, "kernel_id") else id(kernel)
-        current_server_url = kernel_server_urls.get(kernel_id, "http://localhost:8888")
-
-        # If server_url has changed, we need to create a new kernel
-        if current_server_url != server_url:
-            logger.info(
-                f"Server URL changed from {current_server_url} to {server_url}, resetting kernel"
-            )
-            try:
-                kernel.stop()  # Properly close the previous kernel
-            except Exception as e:
-                logger.warning(f"Error stopping kernel: {e}")
-            kernel = None
-            # Remove the old entry from our dictionary
-            if kernel_id in kernel_server_urls:
-                del kernel_server_urls[kernel_id]
-        else:
-            return kernel
+    logger.info("Getting kernel with server_url=%s", server_url)
+
+    pool_key = (notebook_path, server_url)
+    pooled = _kernel_pool.get(pool_key)
+    if pooled is not None:
+        kernel = pooled
+        return pooled
 
     # Initialize the kernel
     try:
-        logger.info(f"Initializing kernel client with server_url={server_url}")
+        logger.info("Initializing kernel client with server_url=%s", server_url)
         new_kernel = KernelClient(
             server_url=server_url,
             token=TOKEN,
@@ -188,17 +217,26 @@ def get_kernel(notebook_path: str, server_url: str = None) -> Optional[KernelCli
         )
 
         new_kernel.start()
-        kernel = new_kernel
 
-        # Store the server_url in our dictionary using kernel ID as key
-        kernel_id = (
-            new_kernel.kernel_id if hasattr(new_kernel, "kernel_id") else id(new_kernel)
-        )
-        kernel_server_urls[kernel_id] = server_url
+        # Evict the least recently pooled kernel if the pool is full
+        # (dicts preserve insertion order).
+        while len(_kernel_pool) >= MAX_POOLED_KERNELS:
+            old_key = next(iter(_kernel_pool))
+            old_kernel = _kernel_pool.pop(old_key)
+            try:
+                old_kernel.stop()
+            except Exception as e:
+                logger.warning("Error stopping evicted kernel: %s", e)
+
+        _kernel_pool[pool_key] = new_kernel
+        kernel = new_kernel
 
         return kernel
     except Exception as e:
-        logger.warning(f"Failed to initialize kernel client: {e}")
+        logger.warning("Failed to initialize kernel client: %s", e)
+        # The cached kernel ID may be the stale part; force a fresh lookup
+        # on the next attempt.
+        _kernel_id_cache.pop((notebook_path, server_url), None)
         raise McpError(
             ErrorData(
                 code=INTERNAL_ERROR,
@@ -226,6 +264,12 @@ def notebook_client(notebook_path: str, server_url: str = None):
         server_url: The server URL to use. Defaults to None, which will use the URL stored
                    for this notebook if available, otherwise http://localhost:8888.
 
+    Clients are cached per (server_url, notebook_path) and reused across
+    calls, so repeated tool invocations share pooled HTTP connections. On
+    reuse the client is refreshed so this call observes edits made by the
+    user since the previous tool call, and pending writes are flushed when
+    the block exits.
+
     Yields
     ------
         NotebookClient: The notebook client instance that is connected to the Jupyter notebook.
@@ -242,18 +286,25 @@ def notebook_client(notebook_path: str, server_url: str = None):
     if server_url is None:
         server_url = NotebookState.get_server_url(notebook_path)
 
-    logger.info(f"Creating notebook client with server_url={server_url}")
+    key = (server_url, notebook_path)
+    with _notebook_clients_lock:
+        notebook = _notebook_clients.get(key)
+        if notebook is None:
+            logger.info("Creating notebook client with server_url=%s", server_url)
+            notebook = NotebookClient(
+                server_url=server_url, notebook_path=notebook_path, token=TOKEN
+            )
+            notebook.connect()
+            _notebook_clients[key] = notebook
+        else:
+            # Drop the client's local content cache so this call sees any
+            # changes made on the server since the last tool invocation.
+            notebook.refresh()
 
-    notebook = None
     try:
-        notebook = NotebookClient(
-            server_url=server_url, notebook_path=notebook_path, token=TOKEN
-        )
-        notebook.connect()
         yield notebook
     finally:
-        if notebook is not None:
-            notebook.disconnect()
+        notebook.flush()
 
 
 @mcp.tool()
@@ -335,28 +386,30 @@ def query_notebook(
         ValueError: If invalid query_type or missing required parameters
         McpError: If there's an error connecting to the Jupyter server
     """
-    if query_type == "view_source":
-        result = _query_view_source(
-            notebook_path, execution_count, position_index, server_url
+    # Normalize once at the tool boundary; the private helpers below assume
+    # the extension is already present.
+    notebook_path = _ensure_ipynb_extension(notebook_path)
+
+    entry = _QUERY_DISPATCH.get(query_type)
+    if entry is None:
+        raise ValueError(
+            f"Invalid query_type: {query_type}. Must be one of: {', '.join(_QUERY_DISPATCH)}"
         )
+
+    handler, reads_notebook = entry
+    result = handler(
+        notebook_path, execution_count, position_index, cell_id, server_url
+    )
+    if reads_notebook:
         # Update hash after viewing notebook content
         NotebookState.update_hash(notebook_path, server_url, caller="query_notebook")
-        return result
-    elif query_type == "check_server":
-        # No notebook access, no hash update needed
-        return _query_check_server(server_url or "http://localhost:8888")
-    elif query_type == "list_sessions":
-        # No notebook access, no hash update needed
-        return _query_list_sessions(server_url or "http://localhost:8888")
-    elif query_type == "get_position_index":
-        result = _query_get_position_index(notebook_path, execution_count, cell_id)
-        # This accesses notebook content, so update hash
-        NotebookState.update_hash(notebook_path, server_url, caller="query_notebook")
-        return result
-    else:
-        raise ValueError(
-            f"Invalid query_type: {query_type}. Must be one of: view_source, check_server, list_sessions, get_position_index"
-        )
+    return result
+
+
+# Substrings marking data MIME types that get replaced with placeholders when
+# filtering cell outputs; hoisted so the per-key checks share one definition.
+_IMAGE_DATA_MARKERS = ("image", "png", "jpeg")
+_HTML_DATA_MARKER = "html"
 
 
 def _filter_cell_outputs(cell_data: Union[dict, list[dict]]) -> Union[dict, list[dict]]:
@@ -366,6 +419,15 @@ def _filter_cell_outputs(cell_data: Union[dict, list[dict]]) -> Union[dict, list
         if not isinstance(cell, dict):
             return cell
 
+        # Fast path: cells whose outputs carry no data payloads (markdown
+        # cells, plain prints and reprs - the common case) have nothing to
+        # strip, so hand them back by reference instead of rebuilding dicts.
+        outputs = cell.get("outputs")
+        if not outputs or not any(
+            isinstance(output, dict) and "data" in output for output in outputs
+        ):
+            return cell
+
         # Keep essential cell data but filter outputs
         filtered_cell = {
             "cell_type": cell.get("cell_type"),
@@ -382,6 +444,11 @@ def _filter_cell_outputs(cell_data: Union[dict, list[dict]]) -> Union[dict, list
                 filtered_outputs = []
                 for output in cell["outputs"]:
                     if isinstance(output, dict):
+                        if "data" not in output:
+                            # Nothing to strip from plain stream/error
+                            # outputs; reuse them by reference.
+                            filtered_outputs.append(output)
+                            continue
                         filtered_output = {
                             "output_type": output.get("output_type"),
                         }
@@ -396,13 +463,14 @@ def _filter_cell_outputs(cell_data: Union[dict, list[dict]]) -> Union[dict, list
                         if "data" in output:
                             data_types = list(output["data"].keys())
                             if any(
-                                "image" in dt or "png" in dt or "jpeg" in dt
+                                marker in dt
                                 for dt in data_types
+                                for marker in _IMAGE_DATA_MARKERS
                             ):
                                 filtered_output["data"] = {
                                     "[filtered]": f"Image data present ({', '.join(data_types)})"
                                 }
-                            elif any("html" in dt for dt in data_types):
+                            elif any(_HTML_DATA_MARKER in dt for dt in data_types):
                                 filtered_output["data"] = {
                                     "[filtered]": f"HTML data present ({', '.join(data_types)})"
                                 }
@@ -422,6 +490,23 @@ def _filter_cell_outputs(cell_data: Union[dict, list[dict]]) -> Union[dict, list
         return filter_single_cell(cell_data)
 
 
+def _find_execution_count_matches(cells: list, execution_count: int) -> list:
+    """Find positions of cells with the given execution count.
+
+    Cells are plain dicts here, so one linear scan is as cheap as building a
+    reverse index would be. The scan stops as soon as a second match makes
+    the result ambiguous, which keeps the uniqueness check without paying
+    for a full sweep.
+    """
+    matches = []
+    for i, cell in enumerate(cells):
+        if cell.get("execution_count") == execution_count:
+            matches.append(i)
+            if len(matches) > 1:
+                break
+    return matches
+
+
 def _query_view_source(
     notebook_path: str,
     execution_count: int = None,
@@ -439,9 +524,6 @@ def _query_view_source(
     if execution_count is not None and position_index is not None:
         raise ValueError("Cannot provide both execution_count and position_index.")
 
-    # Ensure the notebook path has the .ipynb extension
-    notebook_path = _ensure_ipynb_extension(notebook_path)
-
     if execution_count is None and position_index is None:
         logger.info("Viewing all cells")
         view_all = True
@@ -449,18 +531,15 @@ def _query_view_source(
         view_all = False
 
     with notebook_client(notebook_path, server_url) as notebook:
+        # One fetch serves the whole query: the view-all return, the
+        # execution_count scan, and the final single-cell lookup.
+        cells = notebook._doc.ycells.to_py()
         if view_all:
-            raw_cells = notebook._doc.ycells.to_py()
-            return _filter_cell_outputs(raw_cells)
+            return _filter_cell_outputs(cells)
 
         if position_index is None:
             # Find position index within the current notebook context
-            position_indices = set()
-            execution_count_int = execution_count if execution_count is not None else -1
-
-            for i, cell in enumerate(notebook._doc.ycells):
-                if cell.get("execution_count") == execution_count_int:
-                    position_indices.add(i)
+            position_indices = _find_execution_count_matches(cells, execution_count)
 
             if len(position_indices) != 1:
                 # Get comprehensive cell information for better error message
@@ -484,17 +563,22 @@ def _query_view_source(
                         f"Multiple cells found with execution count {execution_count}"
                     )
 
-            position_index = position_indices.pop()
+            position_index = position_indices[0]
 
-        raw_cell = notebook[position_index]
+        try:
+            raw_cell = cells[position_index]
+        except IndexError:
+            raise IndexError(f"Cell index {position_index} out of range")
         return _filter_cell_outputs(raw_cell)
 
 
 def _query_check_server(server_url: str) -> str:
     """Check if the user-provided Jupyter server is running and accessible."""
     try:
-        response = requests.get(
-            f"{server_url}/api/sessions", headers={"Authorization": f"token {TOKEN}"}
+        response = http_session.get(
+            f"{server_url}/api/sessions",
+            headers={"Authorization": f"token {TOKEN}"},
+            timeout=10,
         )
         response.raise_for_status()
         return "Jupyter server is running"
@@ -524,8 +608,6 @@ def _get_available_execution_counts(notebook_path: str) -> dict:
             - code_cells: number of code cells
             - unexecuted_cells: number of code cells without execution count
     """
-    notebook_path = _ensure_ipynb_extension(notebook_path)
-
     with notebook_client(notebook_path) as notebook:
         cells_info = {
             "execution_counts": [],
@@ -583,9 +665,6 @@ def _query_get_position_index(
     if execution_count is not None and cell_id is not None:
         raise ValueError("Must provide either execution_count or cell_id (got both).")
 
-    # Ensure the notebook path has the .ipynb extension
-    notebook_path = _ensure_ipynb_extension(notebook_path)
-
     # Add parameter validation and user guidance
     if execution_count is not None:
         # Validate execution_count range
@@ -600,24 +679,22 @@ def _query_get_position_index(
                 "Are you sure this is correct? Most notebooks have execution counts in the 1-100 range. "
                 "If you meant to use position_index, use position_index parameter instead."
             )
-        execution_count_int = execution_count
-
-    # Set placeholder values for the search
-    # In each case we set one of the two params to a placeholder value that the actual notebook
-    # metadata never uses (don't use None because metadata does use that sometimes).
-    if execution_count is not None:
-        cell_id = "[placeholder-id]"
-    else:
-        execution_count_int = -1
 
     with notebook_client(notebook_path) as notebook:
-        position_indices = set()
-        for i, cell in enumerate(notebook._doc.ycells):
-            if (
-                cell.get("execution_count") == execution_count_int
-                or cell.get("id") == cell_id
-            ):
-                position_indices.add(i)
+        # Two specialized scans, each stopping as early as possible: cell ids
+        # are unique so that scan stops at the first hit, while the
+        # execution_count scan keeps the uniqueness check but stops as soon
+        # as a second match proves it ambiguous.
+        if execution_count is not None:
+            position_indices = _find_execution_count_matches(
+                notebook._doc.ycells, execution_count
+            )
+        else:
+            position_indices = []
+            for i, cell in enumerate(notebook._doc.ycells):
+                if cell.get("id") == cell_id:
+                    position_indices.append(i)
+                    break
 
         if len(position_indices) != 1:
             # Get comprehensive cell information for better error message
@@ -659,17 +736,51 @@ def _query_get_position_index(
                         "Try using position_index instead, or execute the cell first to get an execution_count"
                     )
 
-                if cell_id is not None and cell_id != "[placeholder-id]":
+                if cell_id is not None:
                     error_parts.append(f"No cell found with cell_id={cell_id}")
 
                 error_message = ". ".join(error_parts)
             else:
                 # Multiple matching cells found (should be rare)
-                error_message = f"Found {len(position_indices)} cells matching the criteria at positions {sorted(position_indices)}."
+                error_message = f"Found multiple cells matching the criteria, starting at positions {position_indices}."
 
             raise ValueError(error_message)
 
-        return position_indices.pop()
+        return position_indices[0]
+
+
+# Handler table for query_notebook: maps query_type to (handler, reads_notebook).
+# Handlers share one positional signature; reads_notebook marks queries that
+# touch notebook content and therefore refresh the state hash. This is the
+# single source of truth for valid query types.
+_QUERY_DISPATCH = {
+    "view_source": (
+        lambda notebook_path, execution_count, position_index, cell_id, server_url: (
+            _query_view_source(
+                notebook_path, execution_count, position_index, server_url
+            )
+        ),
+        True,
+    ),
+    "check_server": (
+        lambda notebook_path, execution_count, position_index, cell_id, server_url: (
+            _query_check_server(server_url or "http://localhost:8888")
+        ),
+        False,
+    ),
+    "list_sessions": (
+        lambda notebook_path, execution_count, position_index, cell_id, server_url: (
+            _query_list_sessions(server_url or "http://localhost:8888")
+        ),
+        False,
+    ),
+    "get_position_index": (
+        lambda notebook_path, execution_count, position_index, cell_id, server_url: (
+            _query_get_position_index(notebook_path, execution_count, cell_id)
+        ),
+        True,
+    ),
+}
 
 
 @mcp.tool()
@@ -680,6 +791,7 @@ def modify_notebook_cells(
     cell_content: str = None,
     position_index: int = None,
     execute: bool = True,
+    cells: list = None,
 ) -> dict:
     r"""Modify notebook cells (add, edit, delete) on the user-provided server.
 
@@ -708,12 +820,16 @@ def modify_notebook_cells(
             - 'add_markdown': Add a markdown cell at end or specific position
             - 'edit_markdown': Edit an existing markdown cell at specific position
             - 'delete': Delete a cell at specific position
+            - 'bulk_add': Add several cells at the end in one server write
         cell_content: Content for the cell (required for add_code, edit_code, add_markdown, edit_markdown)
         position_index: Position index (0-indexed cell location) for operations. Must be an integer.
             - Optional for add_code/add_markdown: if provided, inserts at that position; if not, adds at end
             - Required for edit_code/edit_markdown/delete: specifies which cell to modify
             Examples: position_index=0 (first cell), position_index=2 (third cell)
         execute: Whether to execute code cells after adding/editing (default: True)
+        cells: (For bulk_add) List of cell dicts, each with 'cell_type' ('code' or
+            'markdown') and 'content'. Cells are appended in order and written to the
+            server in a single save instead of one save per cell.
 
     Returns
     -------
@@ -722,6 +838,7 @@ def modify_notebook_cells(
             - For add_code/edit_code with execute=False: empty dict
             - For add_markdown/edit_markdown: message and error fields
             - For delete: message and error fields
+            - For bulk_add: results list with one entry per added cell
 
     Raises
     ------
@@ -729,24 +846,12 @@ def modify_notebook_cells(
         McpError: If there's an error connecting to the Jupyter server
         IndexError: If position_index is out of range
     """
-    if operation == "add_code":
-        return _modify_add_code_cell(
-            notebook_path, cell_content, execute, position_index
-        )
-    elif operation == "edit_code":
-        return _modify_edit_code_cell(
-            notebook_path, position_index, cell_content, execute
-        )
-    elif operation == "add_markdown":
-        return _modify_add_markdown_cell(notebook_path, cell_content, position_index)
-    elif operation == "edit_markdown":
-        return _modify_edit_markdown_cell(notebook_path, position_index, cell_content)
-    elif operation == "delete":
-        return _modify_delete_cell(notebook_path, position_index)
-    else:
+    handler = _MODIFY_DISPATCH.get(operation)
+    if handler is None:
         raise ValueError(
-            f"Invalid operation: {operation}. Must be one of: add_code, edit_code, add_markdown, edit_markdown, delete"
+            f"Invalid operation: {operation}. Must be one of: {', '.join(_MODIFY_DISPATCH)}"
         )
+    return handler(notebook_path, cell_content, position_index, execute, cells)
 
 
 def _modify_add_code_cell(
@@ -791,13 +896,15 @@ def _modify_add_code_cell(
         try:
             logger.info("Cell added successfully, now executing")
             # Use the internal execution function which applies proper filtering
-            results = _execute_cell_internal(notebook_path, position_index)
+            results = _execute_cell_internal(
+                notebook_path, position_index, notebook=notebook
+            )
             return results
         except Exception as e:
             import traceback
 
-            logger.error(f"Error during execution: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.error("Error during execution: %s", e)
+            logger.error("Traceback: %s", traceback.format_exc())
             # Return partial results if we have them
             results = {
                 "error": str(e),
@@ -807,6 +914,59 @@ def _modify_add_code_cell(
             return results
 
 
+def _modify_bulk_add(notebook_path: str, cells: list, execute: bool = True) -> dict:
+    """Add several cells to the end of a notebook in one client session.
+
+    All cells are appended under a single batched save, so N added cells
+    cost one server write instead of N. Code cells are then executed in
+    order (when execute=True) through the same open client. Agents building
+    up a notebook cell by cell should prefer this over repeated add_code /
+    add_markdown calls.
+    """
+    if not cells:
+        raise ValueError("cells is required for bulk_add operation")
+
+    added = []
+    results = []
+    with notebook_client(notebook_path) as notebook:
+        with notebook.batch():
+            for cell in cells:
+                cell_type = cell.get("cell_type", "code")
+                content = cell.get("content")
+                if not content:
+                    raise ValueError(
+                        "Each cell in bulk_add must include non-empty 'content'"
+                    )
+                if cell_type == "code":
+                    added.append((notebook.add_code_cell(content), "code"))
+                elif cell_type == "markdown":
+                    added.append((notebook.add_markdown_cell(content), "markdown"))
+                else:
+                    raise ValueError(
+                        f"Invalid cell_type: {cell_type}. Must be one of: code, markdown"
+                    )
+
+        for position_index, cell_type in added:
+            if cell_type == "code" and execute:
+                try:
+                    result = _execute_cell_internal(
+                        notebook_path, position_index, notebook=notebook
+                    )
+                    results.append({"position_index": position_index, **result})
+                except Exception as e:
+                    logger.error("Error executing bulk-added cell: %s", e)
+                    results.append({"position_index": position_index, "error": str(e)})
+            else:
+                results.append(
+                    {
+                        "position_index": position_index,
+                        "message": f"{cell_type} cell added",
+                    }
+                )
+
+    return {"results": results}
+
+
 def _modify_edit_code_cell(
     notebook_path: str, position_index: int, cell_content: str, execute: bool = True
 ) -> dict:
@@ -833,9 +993,6 @@ def _modify_edit_code_cell(
 
     logger.info("Editing code cell")
 
-    # Ensure the notebook path has the .ipynb extension
-    notebook_path = _ensure_ipynb_extension(notebook_path)
-
     full_cell_contents = {
         "cell_type": "code",
         "execution_count": None,
@@ -850,7 +1007,9 @@ def _modify_edit_code_cell(
         # Update cell source code.
         notebook[position_index] = full_cell_contents
         if execute:
-            results = _execute_cell_internal(notebook_path, position_index)
+            results = _execute_cell_internal(
+                notebook_path, position_index, notebook=notebook
+            )
 
     return results
 
@@ -870,9 +1029,6 @@ def _modify_add_markdown_cell(
 
     logger.info("Adding markdown cell")
 
-    # Ensure the notebook path has the .ipynb extension
-    notebook_path = _ensure_ipynb_extension(notebook_path)
-
     results = {"message": "", "error": ""}
     try:
         with notebook_client(notebook_path) as notebook:
@@ -888,7 +1044,7 @@ def _modify_add_markdown_cell(
                 results["message"] = "Markdown cell added"
 
     except Exception as e:
-        logger.error(f"Error adding markdown cell: {e}")
+        logger.error("Error adding markdown cell: %s", e)
         results["error"] = str(e)
 
     return results
@@ -930,9 +1086,6 @@ def _modify_edit_markdown_cell(
 
     logger.info("Editing markdown cell")
 
-    # Ensure the notebook path has the .ipynb extension
-    notebook_path = _ensure_ipynb_extension(notebook_path)
-
     full_cell_contents = {
         "cell_type": "markdown",
         "metadata": {},
@@ -947,7 +1100,7 @@ def _modify_edit_markdown_cell(
             notebook[position_index] = full_cell_contents
         results["message"] = "Markdown cell edited"
     except Exception as e:
-        logger.error(f"Error editing markdown cell: {e}")
+        logger.error("Error editing markdown cell: %s", e)
         results["error"] = str(e)
 
     return results
@@ -970,9 +1123,6 @@ def _modify_delete_cell(notebook_path: str, position_index: int) -> dict:
     if position_index is None:
         raise ValueError("position_index is required for delete operation")
 
-    # Ensure the notebook path has the .ipynb extension
-    notebook_path = _ensure_ipynb_extension(notebook_path)
-
     results = {"message": "", "error": ""}
     with notebook_client(notebook_path) as notebook:
         try:
@@ -983,6 +1133,30 @@ def _modify_delete_cell(notebook_path: str, position_index: int) -> dict:
     return results
 
 
+# Handler table for modify_notebook_cells; the single source of truth for
+# valid cell operations.
+_MODIFY_DISPATCH = {
+    "add_code": lambda notebook_path, cell_content, position_index, execute, cells: (
+        _modify_add_code_cell(notebook_path, cell_content, execute, position_index)
+    ),
+    "edit_code": lambda notebook_path, cell_content, position_index, execute, cells: (
+        _modify_edit_code_cell(notebook_path, position_index, cell_content, execute)
+    ),
+    "add_markdown": lambda notebook_path, cell_content, position_index, execute, cells: (
+        _modify_add_markdown_cell(notebook_path, cell_content, position_index)
+    ),
+    "edit_markdown": lambda notebook_path, cell_content, position_index, execute, cells: (
+        _modify_edit_markdown_cell(notebook_path, position_index, cell_content)
+    ),
+    "delete": lambda notebook_path, cell_content, position_index, execute, cells: (
+        _modify_delete_cell(notebook_path, position_index)
+    ),
+    "bulk_add": lambda notebook_path, cell_content, position_index, execute, cells: (
+        _modify_bulk_add(notebook_path, cells, execute)
+    ),
+}
+
+
 @mcp.tool()
 @NotebookState.state_dependent
 def execute_notebook_code(
@@ -1012,7 +1186,7 @@ def execute_notebook_code(
                        relative to the Jupyter server root.
         execution_type: Type of execution operation. Options:
             - 'execute_cell': Execute an existing code cell
-            - 'install_packages': Install packages using uv pip in the notebook environment
+            - 'install_packages': Install packages using pip in the notebook environment
         position_index: (For execute_cell) Positional index of cell to execute
         package_names: (For install_packages) Space-separated list of package names to install
 
@@ -1029,19 +1203,23 @@ def execute_notebook_code(
         IndexError: If position_index is out of range
         RuntimeError: If kernel execution fails
     """
-    if execution_type == "execute_cell":
-        return _execute_cell_internal(notebook_path, position_index)
-    elif execution_type == "install_packages":
-        return _execute_install_packages(notebook_path, package_names)
-    else:
+    handler = _EXECUTE_DISPATCH.get(execution_type)
+    if handler is None:
         raise ValueError(
-            f"Invalid execution_type: {execution_type}. Must be one of: execute_cell, install_packages"
+            f"Invalid execution_type: {execution_type}. Must be one of: {', '.join(_EXECUTE_DISPATCH)}"
         )
+    return handler(notebook_path, position_index, package_names)
 
 
-def _execute_cell_internal(notebook_path: str, position_index: int) -> dict:
+def _execute_cell_internal(
+    notebook_path: str, position_index: int, notebook: Optional[NotebookClient] = None
+) -> dict:
     """Execute an existing code cell in a Jupyter notebook.
 
+    If a notebook client is passed in, it is used directly; callers that
+    already hold an open client (add_code, edit_code) avoid a second
+    client round trip for the add-then-execute sequence.
+
     In most cases you should call modify_notebook_cells instead, but occasionally
     you might want to re-execute a cell after changing a *different* cell.
 
@@ -1061,48 +1239,47 @@ def _execute_cell_internal(notebook_path: str, position_index: int) -> dict:
     if position_index is None:
         raise ValueError("position_index is required for execute_cell operation")
 
-    # Ensure the notebook path has the .ipynb extension
-    notebook_path = _ensure_ipynb_extension(notebook_path)
-
-    # Get kernel using the stored server URL
-    kernel = get_kernel(notebook_path)
+    # Resolve the server URL once and hand it to both the kernel and the
+    # notebook client rather than having each resolve it again.
+    server_url = NotebookState.get_server_url(notebook_path)
+    kernel = get_kernel(notebook_path, server_url)
 
-    with notebook_client(notebook_path) as notebook:
+    if notebook is not None:
         result = notebook.execute_cell(position_index, kernel)
+    else:
+        with notebook_client(notebook_path, server_url) as client:
+            result = client.execute_cell(position_index, kernel)
 
-        # Filter out base64 images from outputs to save tokens
-        if "outputs" in result:
-            result["outputs"] = filter_image_outputs(result["outputs"])
+    # Filter out base64 images from outputs to save tokens
+    if "outputs" in result:
+        result["outputs"] = filter_image_outputs(result["outputs"])
 
-        return result
+    return result
 
 
 def _execute_install_packages(notebook_path: str, package_names: str) -> str:
-    """Install one or more packages using uv pip in the notebook environment.
+    """Install one or more packages using pip in the notebook environment.
 
     Unlike add_code_cell, this shouldn't rely on other code written in the notebook, so we mark
-    it as refreshes_state rather than state_dependent. Assumes 'uv' is available in the
-    environment where the Jupyter kernel is running.
+    it as refreshes_state rather than state_dependent. Uses IPython's %pip magic, which
+    resolves to the kernel's own environment without spawning a shell.
     """
     if not package_names:
         raise ValueError("package_names is required for install_packages operation")
 
-    logger.info(f"Installing packages: {package_names}")
-
-    # Ensure the notebook path has the .ipynb extension
-    notebook_path = _ensure_ipynb_extension(notebook_path)
+    logger.info("Installing packages: %s", package_names)
 
-    # Get kernel on demand - rely on NotebookState for server_url
-    try:
-        current_kernel = get_kernel(notebook_path)
-    except McpError:
-        # Just re-raise the error from get_kernel
-        raise
+    # Resolve the server URL once for both the kernel and the client; both
+    # lookups hit the per-(notebook, server) pools on repeat calls.
+    server_url = NotebookState.get_server_url(notebook_path)
+    current_kernel = get_kernel(notebook_path, server_url)
 
     try:
-        with notebook_client(notebook_path) as notebook:
-            # Create a cell that installs the packages using uv pip
-            cell_content = f"!uv pip install {package_names}"
+        with notebook_client(notebook_path, server_url) as notebook:
+            # Create a cell that installs the packages into the kernel's
+            # environment; %pip avoids the extra shell subprocess !uv spawned
+            # and works wherever ipykernel runs.
+            cell_content = f"%pip install {package_names}"
             cell_index = notebook.add_code_cell(cell_content)
             result = notebook.execute_cell(cell_index, current_kernel)
 
@@ -1120,10 +1297,52 @@ def _execute_install_packages(notebook_path: str, package_names: str) -> str:
             return f"Installation of packages [{package_names}]: {installation_result}"
 
     except Exception as e:
-        logger.error(f"Error installing packages: {e}")
+        logger.error("Error installing packages: %s", e)
         return f"Error: {str(e)}"
 
 
+# Handler table for execute_notebook_code; the single source of truth for
+# valid execution types.
+_EXECUTE_DISPATCH = {
+    "execute_cell": lambda notebook_path, position_index, package_names: (
+        _execute_cell_internal(notebook_path, position_index)
+    ),
+    "install_packages": lambda notebook_path, position_index, package_names: (
+        _execute_install_packages(notebook_path, package_names)
+    ),
+}
+
+
+def _wait_for_notebook(
+    notebook_path: str,
+    server_url: str,
+    timeout: float = 5.0,
+    poll_interval: float = 0.05,
+) -> None:
+    """Poll the contents API until the notebook is visible on the server.
+
+    Replaces a fixed post-creation sleep: returns as soon as the server
+    reports the file (typically well under 100ms locally) instead of always
+    paying the worst-case delay. Gives up quietly after `timeout` seconds
+    and lets the subsequent hash update surface any real failure.
+    """
+    deadline = time.monotonic() + timeout
+    url = f"{server_url}/api/contents/{notebook_path}?content=0"
+    while time.monotonic() < deadline:
+        try:
+            response = http_session.get(
+                url, headers={"Authorization": f"token {TOKEN}"}, timeout=5
+            )
+            if response.status_code == 200:
+                return
+        except Exception:
+            pass
+        time.sleep(poll_interval)
+    logger.warning(
+        "Notebook %s not visible on server after %ss", notebook_path, timeout
+    )
+
+
 @mcp.tool()
 @NotebookState.refreshes_state
 def setup_notebook(notebook_path: str, server_url: str = None) -> dict:
@@ -1164,9 +1383,7 @@ def setup_notebook(notebook_path: str, server_url: str = None) -> dict:
     """
     global kernel
 
-    # Ensure the notebook path has the .ipynb extension
-    notebook_path = _ensure_ipynb_extension(notebook_path)
-
+    # The refreshes_state decorator has already normalized notebook_path.
     # Only set the server URL if a non-None value is provided
     if server_url is not None:
         NotebookState.set_server_url(notebook_path, server_url)
@@ -1174,8 +1391,6 @@ def setup_notebook(notebook_path: str, server_url: str = None) -> dict:
     server_url = NotebookState.get_server_url(notebook_path)
 
     # Use the notebook module but with the local TOKEN
-    from .notebook import prepare_notebook
-
     info = prepare_notebook(notebook_path, server_url, TOKEN)
 
     # Filter the notebook content to remove base64 images
@@ -1183,13 +1398,24 @@ def setup_notebook(notebook_path: str, server_url: str = None) -> dict:
         if "cells" in info["content"]:
             info["content"]["cells"] = _filter_cell_outputs(info["content"]["cells"])
 
-    # Refresh the state hash
-    time.sleep(0.5)  # Short delay to ensure notebook is fully saved
+    # Refresh the state hash once the server reports the notebook exists
+    _wait_for_notebook(notebook_path, server_url)
     NotebookState.update_hash(notebook_path, server_url, caller="notebook_final")
 
     return info
 
 
+# The complete MCP tool surface. create_server re-registers exactly these when
+# rebuilding the server with custom settings, and tests size their assertions
+# from it instead of hard-coding a count.
+TOOLS = (
+    query_notebook,
+    modify_notebook_cells,
+    execute_notebook_code,
+    setup_notebook,
+)
+
+
 def create_server(
     host: str = "127.0.0.1", port: int = 8000, stateless_http: bool = False
 ) -> FastMCP:
@@ -1206,10 +1432,8 @@ def create_server(
         mcp = FastMCP("notebook", host=host, port=port, stateless_http=stateless_http)
 
         # Re-register all the tools
-        mcp.tool()(query_notebook)
-        mcp.tool()(modify_notebook_cells)
-        mcp.tool()(execute_notebook_code)
-        mcp.tool()(setup_notebook)
+        for tool in TOOLS:
+            mcp.tool()(tool)
 
     return mcp
 
@@ -1225,5 +1449,5 @@ if __name__ == "__main__":
     server = create_server()
 
     # Initialize and run the server
-    logger.info(f"Starting MCP notebook server with {transport} transport")
+    logger.info("Starting MCP notebook server with %s transport", transport)
     server.run(transport=transport)
@@ -1,5 +1,4 @@
 import hashlib
-import json
 import logging
 import time
 from functools import wraps
@@ -9,7 +8,7 @@ import requests
 from mcp.shared.exceptions import McpError
 from mcp.types import INTERNAL_ERROR, ErrorData
 
-from .utils import TOKEN, _ensure_ipynb_extension
+from .utils import TOKEN, _ensure_ipynb_extension, json_dumps
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -33,9 +32,19 @@ class NotebookState:
         McpError: When state-dependent operations are attempted with outdated state
     """
 
+    # The class is a namespace of classmethods and is never instantiated;
+    # empty __slots__ makes that explicit and keeps any accidental instance
+    # from growing a per-instance __dict__.
+    __slots__ = ()
+
     contents_hash: str = ""
     # Add a dictionary to store server URLs for each notebook path
     notebook_server_urls: dict = {}
+    # Cache of computed hashes keyed by (notebook_path, server_url), storing
+    # (last_modified, hash). When the server reports an unchanged
+    # last_modified, the cached digest is reused instead of re-downloading
+    # and rehashing the whole notebook.
+    _hash_cache: dict = {}
 
     @classmethod
     def get_server_url(cls, notebook_path: str) -> str:
@@ -61,7 +70,9 @@ class NotebookState:
         """
         notebook_path = _ensure_ipynb_extension(notebook_path)
         cls.notebook_server_urls[notebook_path] = server_url
-        logger.info(f"Associated notebook {notebook_path} with server URL {server_url}")
+        logger.info(
+            "Associated notebook %s with server URL %s", notebook_path, server_url
+        )
 
     @classmethod
     def _get_new_hash(cls, notebook_path: str, server_url: str = None) -> str:
@@ -74,7 +85,7 @@ class NotebookState:
 
         Returns
         -------
-            str: SHA-256 hash of the notebook contents
+            str: BLAKE2b hash of the notebook contents
 
         Raises
         ------
@@ -93,15 +104,45 @@ class NotebookState:
         # haven't found a good way to get this working reliably.
         time.sleep(1.5)
 
+        headers = {"Authorization": f"token {TOKEN}"}
+
+        # Cheap probe first: content=0 returns metadata only. If the server's
+        # last_modified hasn't advanced since we last hashed this notebook,
+        # the cached digest is still valid and the full download is skipped.
+        cache_key = (notebook_path, server_url)
+        probe = requests.get(
+            f"{server_url}/api/contents/{notebook_path}?content=0",
+            headers=headers,
+            timeout=10,
+        )
+        probe.raise_for_status()
+        last_modified = probe.json().get("last_modified")
+
+        cached = cls._hash_cache.get(cache_key)
+        if (
+            cached is not None
+            and last_modified is not None
+            and cached[0] == last_modified
+        ):
+            return cached[1]
+
         response = requests.get(
             f"{server_url}/api/contents/{notebook_path}",
-            headers={"Authorization": f"token {TOKEN}"},
+            headers=headers,
+            timeout=10,
         )
 
         response.raise_for_status()
         notebook_content = response.json()["content"]
 
-        return hashlib.sha256(json.dumps(notebook_content).encode()).hexdigest()
+        # blake2b is the fastest stdlib hash and this digest is only an
+        # equality check for missed edits, so cryptographic strength (and the
+        # full 64-byte digest) buys nothing here.
+        hashed = hashlib.blake2b(
+            json_dumps(notebook_content), digest_size=16
+        ).hexdigest()
+        cls._hash_cache[cache_key] = (last_modified, hashed)
+        return hashed
 
     @classmethod
     def update_hash(
@@ -132,12 +173,14 @@ class NotebookState:
         prefix = f"[{caller}] " if caller else ""
         if old_hash != cls.contents_hash:
             logger.info(
-                f"{prefix}Updated notebook hash from {old_hash!r} to "
-                f"{cls.contents_hash!r}."
+                "%sUpdated notebook hash from %r to %r.",
+                prefix,
+                old_hash,
+                cls.contents_hash,
             )
         else:
             logger.info(
-                f"{prefix}No change in notebook hash (still {cls.contents_hash!r})."
+                "%sNo change in notebook hash (still %r).", prefix, cls.contents_hash
             )
 
     @classmethod
@@ -1,30 +1,73 @@
-import hashlib
-import json
-import logging
 import os
-import re
-import signal
-import subprocess
-import time
-from collections import defaultdict
-from contextlib import contextmanager
-from functools import wraps
-from typing import List, Optional, Union
+from functools import lru_cache
+from typing import Any, List, Union
 
+import orjson
 import requests
-from jupyter_kernel_client import KernelClient
-from mcp.server.fastmcp import FastMCP
-from mcp.shared.exceptions import McpError
-from mcp.types import INTERNAL_ERROR, INVALID_PARAMS, ErrorData
-from rich.console import Console
-from rich.logging import RichHandler
+from requests.adapters import HTTPAdapter
 
 TOKEN = os.getenv("TOKEN", "BLOCK")
 
+# Shared session for one-off REST calls to the Jupyter server (session
+# listings, kernel lookups, health checks). Reusing pooled connections avoids
+# a fresh TCP/TLS handshake on every tool invocation.
+http_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20)
+http_session.mount("http://", _adapter)
+http_session.mount("https://", _adapter)
 
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize an object to JSON bytes using orjson.
+
+    orjson is significantly faster than stdlib json, which matters for
+    notebooks whose cell outputs contain large payloads (images, dataframes).
+    Returning orjson's native bytes avoids decoding to str and re-encoding
+    when the result is sent as an HTTP request body.
+
+    Args:
+        obj: Object to serialize
+
+    Returns
+    -------
+        bytes: JSON-encoded bytes
+    """
+    return orjson.dumps(obj)
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str using orjson.
+
+    Args:
+        data: JSON-encoded bytes or string
+
+    Returns
+    -------
+        Any: The deserialized object
+    """
+    return orjson.loads(data)
+
+
+_IPYNB_SUFFIX = ".ipynb"
+
+# Image MIME types stripped from outputs, mapped to their display labels.
+# Iteration order determines the order formats appear in the replacement
+# indicator text.
+_IMAGE_MIME_LABELS = {
+    "image/png": "PNG",
+    "image/jpeg": "JPEG",
+    "image/svg+xml": "SVG+XML",
+    "image/gif": "GIF",
+}
+
+
+@lru_cache(maxsize=4096)
 def _ensure_ipynb_extension(notebook_path: str) -> str:
     """Ensure the notebook path has the .ipynb extension.
 
+    Memoized: tool entry points and the state decorators normalize the same
+    handful of paths on every call, so repeat lookups skip the string work.
+
     Args:
         notebook_path: Path to a notebook file
 
@@ -32,9 +75,84 @@ def _ensure_ipynb_extension(notebook_path: str) -> str:
     -------
         str: The notebook path with .ipynb extension
     """
-    if not notebook_path.endswith(".ipynb"):
-        return f"{notebook_path}.ipynb"
-    return notebook_path
+    if notebook_path.endswith(_IPYNB_SUFFIX):
+        return notebook_path
+    return notebook_path + _IPYNB_SUFFIX
+
+
+def _filter_image_output(output: dict) -> dict:
+    """Return a copy of one output with base64 image data replaced by text.
+
+    Outputs without image data are returned as shallow copies; the original
+    dict is never mutated.
+
+    Args:
+        output: Output dictionary from cell execution
+
+    Returns
+    -------
+        dict: The filtered output
+    """
+    # Create a copy of the output to avoid modifying the original
+    filtered_output = output.copy()
+
+    # Check for image data in display_data or execute_result outputs
+    if output.get("output_type") not in ("display_data", "execute_result"):
+        return filtered_output
+
+    data = output.get("data", {})
+    if not data:
+        return filtered_output
+
+    # Create a copy of data to avoid modifying the original
+    filtered_data = data.copy()
+
+    # Check for various image formats and replace with text indicators
+    images_found = []
+    for img_type, label in _IMAGE_MIME_LABELS.items():
+        if img_type in filtered_data:
+            # Remove the base64 image data
+            del filtered_data[img_type]
+            images_found.append(label)
+
+    if images_found:
+        # Add a text indicator for the removed images
+        image_indicator = f"Image generated ({', '.join(images_found)} format)"
+        if "text/plain" in filtered_data:
+            # If there's already text/plain content (like "<Figure size...>"),
+            # append the indicator to show image was filtered
+            existing_text = filtered_data["text/plain"]
+
+            # Handle both string and list formats
+            if isinstance(existing_text, list):
+                existing_text_str = "".join(existing_text)
+            else:
+                existing_text_str = existing_text
+
+            if "Figure" in existing_text_str or "Axes" in existing_text_str:
+                # Keep the existing figure description and add our indicator
+                if isinstance(existing_text, list):
+                    filtered_data["text/plain"] = existing_text + [
+                        f" - {image_indicator}"
+                    ]
+                else:
+                    filtered_data["text/plain"] = (
+                        existing_text + f" - {image_indicator}"
+                    )
+            else:
+                # For other text, append on new line
+                if isinstance(existing_text, list):
+                    filtered_data["text/plain"] = existing_text + [
+                        f"\n{image_indicator}"
+                    ]
+                else:
+                    filtered_data["text/plain"] = existing_text + f"\n{image_indicator}"
+        else:
+            # Create new text/plain output
+            filtered_data["text/plain"] = image_indicator
+
+    filtered_output["data"] = filtered_data
+    return filtered_output
 
 
 def filter_image_outputs(outputs: List[dict]) -> List[dict]:
@@ -47,74 +165,7 @@ def filter_image_outputs(outputs: List[dict]) -> List[dict]:
     -------
         List[dict]: Filtered outputs with images replaced by text indicators
     """
-    filtered_outputs = []
-
-    for output in outputs:
-        # Create a copy of the output to avoid modifying the original
-        filtered_output = output.copy()
-
-        # Check for image data in display_data or execute_result outputs
-        if output.get("output_type") in ["display_data", "execute_result"]:
-            data = output.get("data", {})
-            if data:
-                # Create a copy of data to avoid modifying the original
-                filtered_data = data.copy()
-
-                # Check for various image formats and replace with text indicators
-                image_types = ["image/png", "image/jpeg", "image/svg+xml", "image/gif"]
-                images_found = []
-
-                for img_type in image_types:
-                    if img_type in filtered_data:
-                        # Remove the base64 image data
-                        del filtered_data[img_type]
-                        images_found.append(img_type.split("/")[1].upper())
-
-                if images_found:
-                    # Add a text indicator for the removed images
-                    image_indicator = (
-                        f"Image generated ({', '.join(images_found)} format)"
-                    )
-                    if "text/plain" in filtered_data:
-                        # If there's already text/plain content (like "<Figure size...>"),
-                        # append the indicator to show image was filtered
-                        existing_text = filtered_data["text/plain"]
-
-                        # Handle both string and list formats
-                        if isinstance(existing_text, list):
-                            existing_text_str = "".join(existing_text)
-                        else:
-                            existing_text_str = existing_text
-
-                        if "Figure" in existing_text_str or "Axes" in existing_text_str:
-                            # Keep the existing figure description and add our indicator
-                            if isinstance(existing_text, list):
-                                filtered_data["text/plain"] = existing_text + [
-                                    f" - {image_indicator}"
-                                ]
-                            else:
-                                filtered_data["text/plain"] = (
-                                    existing_text + f" - {image_indicator}"
-                                )
-                        else:
-                            # For other text, append on new line
-                            if isinstance(existing_text, list):
-                                filtered_data["text/plain"] = existing_text + [
-                                    f"\n{image_indicator}"
-                                ]
-                            else:
-                                filtered_data["text/plain"] = (
-                                    existing_text + f"\n{image_indicator}"
-                                )
-                    else:
-                        # Create new text/plain output
-                        filtered_data["text/plain"] = image_indicator
-
-                filtered_output["data"] = filtered_data
-
-        filtered_outputs.append(filtered_output)
-
-    return filtered_outputs
+    return [_filter_image_output(output) for output in outputs]
 
 
 def extract_output(output: dict) -> str:
@@ -8,6 +8,7 @@ from mcp_jupyter.rest_client import NotebookClient
 from mcp_jupyter.server import query_notebook
 
 
+@pytest.mark.slow
 def test_check_server_without_notebook(jupyter_server):
     """Test that check_server works without a notebook path."""
     # check_server should work even with a non-existent notebook path
@@ -20,6 +21,7 @@ def test_check_server_without_notebook(jupyter_server):
     assert result == "Jupyter server is running"
 
 
+@pytest.mark.slow
 def test_list_sessions_without_notebook(jupyter_server):
     """Test that list_sessions works without accessing a specific notebook."""
     # list_sessions should work with any notebook path
@@ -32,6 +34,7 @@ def test_list_sessions_without_notebook(jupyter_server):
     assert isinstance(result, list)
 
 
+@pytest.mark.slow
 def test_get_default_kernel_info(jupyter_server):
     """Test that kernel info can be retrieved from the server."""
     # Create a client to test kernel info retrieval
@@ -10,6 +10,10 @@ from mcp_jupyter.server import (
 # TOKEN constant
 TOKEN = "BLOCK"
 
+# Every test here drives a live Jupyter server; excluded from the default
+# fast run by the 'not slow' addopts selection.
+pytestmark = pytest.mark.slow
+
 
 # Server fixtures are now provided by conftest.py
 
@@ -185,6 +189,29 @@ def test_view_source(jupyter_server, test_notebook):
             assert "def add(a, b):" in specific_cell["source"]
 
 
+def test_query_notebook_updates_state_hash(jupyter_server, test_notebook):
+    """Test that viewing a notebook refreshes the tracked contents hash."""
+    from mcp_jupyter.server import NotebookState
+
+    # Seed both cells in one bulk_add call: a single server write instead of
+    # one round trip per add_code.
+    result = modify_notebook_cells(
+        test_notebook,
+        "bulk_add",
+        cells=[
+            {"content": "hash_test_a = 1"},
+            {"content": "hash_test_b = hash_test_a + 1\nprint(hash_test_b)"},
+        ],
+    )
+    assert len(result["results"]) == 2
+
+    # Clear the tracked hash, then query; the view should refresh it
+    NotebookState.contents_hash = ""
+    cells = query_notebook(test_notebook, "view_source")
+    assert any("hash_test_b" in cell.get("source", "") for cell in cells)
+    assert NotebookState.contents_hash != ""
+
+
 def test_get_position_index(jupyter_server, test_notebook):
     """Test getting the position index of a cell."""
     # First, explicitly execute a cell to ensure we have at least one with an execution count